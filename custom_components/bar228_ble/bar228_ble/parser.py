@@ -5,13 +5,10 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import struct
-from collections import namedtuple
 from datetime import datetime
 import logging
-
-# from logging import Logger
-from math import exp
-from typing import Any, Callable, Tuple, TypeVar, cast
+import time
+from typing import Any, Callable, TypeVar, cast
 
 from bleak import BleakClient, BleakError
 from bleak.backends.device import BLEDevice
@@ -38,10 +35,41 @@ BAR228_CHARACTERISTIC_UUID_WRITE4 = "905e8e30-81e9-4796-9b75-b95cf5e30c0b"  # i
 BAR228_CHARACTERISTIC_UUID_WRITE5 = "905e8e34-81e9-4796-9b75-b95cf5e30c0b"  # n
 BAR228_CHARACTERISTIC_UUID_WRITE6 = "905e8e40-81e9-4796-9b75-b95cf5e30c0b"  # r/w
 
+# WRITE4 is the same characteristic as READ, so it is only listed once.
+BAR228_NOTIFY_UUIDS = (
+    BAR228_CHARACTERISTIC_UUID_WRITE1,
+    BAR228_CHARACTERISTIC_UUID_WRITE2,
+    BAR228_CHARACTERISTIC_UUID_WRITE3,
+    BAR228_CHARACTERISTIC_UUID_WRITE4,
+    BAR228_CHARACTERISTIC_UUID_WRITE5,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
+# Sensor notification payload: u16 temperature at offset 3, u8 humidity at
+# offset 6 and u16 pressure at offset 8, all little-endian.
+_SENSOR_STRUCT = struct.Struct("<xxxHxBxH")
+
+# Seconds without a notification before the BLE connection is dropped.
+_IDLE_DISCONNECT_TIMEOUT = 30.0
+
+# Local timezone for the "last" timestamp, refreshed hourly to follow DST.
+_LOCAL_TZ_REFRESH = 3600.0
+_local_tz = datetime.now().astimezone().tzinfo
+_local_tz_expires = time.monotonic() + _LOCAL_TZ_REFRESH
+
+
+def _now_local() -> datetime:
+    """Return the current time in the cached local timezone"""
+    global _local_tz, _local_tz_expires  # pylint: disable=global-statement
+    now = time.monotonic()
+    if now >= _local_tz_expires:
+        _local_tz = datetime.now().astimezone().tzinfo
+        _local_tz_expires = now + _LOCAL_TZ_REFRESH
+    return datetime.now(_local_tz)
+
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class BAR228Device:
     """Response data with information about the BAR228 device"""
 
@@ -50,9 +78,20 @@ class BAR228Device:
     name: str = ""
     identifier: str = ""
     address: str = ""
-    sensors: dict[str, str | float | None] = dataclasses.field(
-        default_factory=lambda: {}
-    )
+    temperature: float | None = None
+    humidity: int | None = None
+    pressure: float | None = None
+    last: datetime | None = None
+
+    @property
+    def sensors(self) -> dict[str, float | datetime | None]:
+        """Sensor readings keyed by sensor type"""
+        return {
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "pressure": self.pressure,
+            "last": self.last,
+        }
 
 
 # pylint: disable=too-many-locals
@@ -61,14 +100,39 @@ class BAR228Device:
 class BAR228BluetoothDeviceData:
     """Data for BAR228 BLE sensors."""
 
-    _event: asyncio.Event | None
+    __slots__ = (
+        "logger",
+        "is_metric",
+        "elevation",
+        "voltage",
+        "_command_data",
+        "_bardevice",
+        "_bleclient",
+        "_event",
+        "_notify_uuids",
+        "_notify_handle",
+        "_notify_char_uuid",
+        "_last_seen",
+        "_notify_count",
+        "_idle_timer",
+        "_disconnect_task",
+    )
+
+    _event: asyncio.Event
     _command_data: bytearray | None
     _bardevice: BAR228Device | None
     _bleclient: BleakClient | None
+    _notify_uuids: tuple[str, ...] | None
+    _notify_handle: int | None
+    _notify_char_uuid: str | None
+    _last_seen: float
+    _notify_count: int
+    _idle_timer: asyncio.TimerHandle | None
+    _disconnect_task: asyncio.Task | None
 
     def __init__(
         self,
-        logger: Logger,
+        logger: logging.Logger,
         elevation: int | None = None,
         is_metric: bool = True,
         voltage: tuple[float, float] = (2.4, 3.2),
@@ -81,35 +145,94 @@ class BAR228BluetoothDeviceData:
         self._command_data = None
         self._bardevice = None
         self._bleclient = None
-        self._event = None
+        self._event = asyncio.Event()
+        self._notify_uuids = None
+        self._notify_handle = None
+        self._notify_char_uuid = None
+        self._last_seen = 0.0
+        self._notify_count = 0
+        self._idle_timer = None
+        self._disconnect_task = None
 
     def notification_handler(
         self, sender: BleakGATTCharacteristic, data: bytearray
     ) -> None:
         """Helper for command events"""
         self._command_data = data
-        self.logger.debug("notification_handler - data received")
-        self.logger.debug(f"notification_handler - sender {sender} : data {data}")
-        self.logger.debug(f"notification_handler - sender.handle {sender.handle}")
-
-        if sender.handle >= 0x0013:
-            self.logger.debug("notification_handler - begin process data")
-            self._bardevice.sensors["temperature"] = (
-                struct.unpack("<H", self._command_data[3:5])[0]
-            ) / 10
-            self._bardevice.sensors["humidity"] = struct.unpack(
-                "@B", self._command_data[6:7]
-            )[0]
-            self._bardevice.sensors["pressure"] = (
-                struct.unpack("<H", self._command_data[8:10])[0]
-            ) / 10
-            self._bardevice.sensors["last"] = datetime.now().astimezone()
-            self.logger.debug("notification_handler - end processed data")
-
-        if self._event is None:
+        self._last_seen = time.monotonic()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("notification_handler - data received")
+            self.logger.debug(
+                "notification_handler - sender %s : data %s", sender, data
+            )
+            self.logger.debug(
+                "notification_handler - sender.handle %s", sender.handle
+            )
+
+        if sender.handle < 0x0013:
+            self._event.set()
             return
+
+        self.logger.debug("notification_handler - begin process data")
+        if self._notify_char_uuid is None:
+            self._notify_handle = sender.handle
+            self._notify_char_uuid = getattr(sender, "uuid", None)
+        temp_raw, hum, pres_raw = _SENSOR_STRUCT.unpack_from(data, 0)
+        device = self._bardevice
+        device.temperature = temp_raw / 10
+        device.humidity = hum
+        device.pressure = pres_raw / 10
+        device.last = _now_local()
+        self._notify_count += 1
+        self.logger.debug("notification_handler - end processed data")
+
         self._event.set()
 
+    def _schedule_idle_disconnect(
+        self, delay: float = _IDLE_DISCONNECT_TIMEOUT
+    ) -> None:
+        """Arm the timer that drops the connection once notifications stop"""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        self._idle_timer = asyncio.get_running_loop().call_later(
+            delay, self._idle_check
+        )
+
+    def _idle_check(self) -> None:
+        """Disconnect if no notification arrived within the idle timeout"""
+        self._idle_timer = None
+        client = self._bleclient
+        if client is None or not client.is_connected:
+            return
+        idle = time.monotonic() - self._last_seen
+        if idle < _IDLE_DISCONNECT_TIMEOUT:
+            self._schedule_idle_disconnect(_IDLE_DISCONNECT_TIMEOUT - idle)
+            return
+        self.logger.debug("_idle_check - idle for %.1fs, disconnecting", idle)
+        self._notify_count = 0
+        self._disconnect_task = asyncio.create_task(client.disconnect())
+
+    def _discover_notify_uuids(self, client: BleakClient) -> tuple[str, ...]:
+        """Return the BAR228 characteristics that support notify or indicate"""
+        uuids = []
+        for service in client.services:
+            for char in service.characteristics:
+                if char.uuid not in BAR228_NOTIFY_UUIDS:
+                    continue
+                if "notify" in char.properties or "indicate" in char.properties:
+                    uuids.append(char.uuid)
+        self.logger.debug("_discover_notify_uuids found %s", uuids)
+        return tuple(uuids)
+
+    async def _start_notify(self, client: BleakClient, uuid: str) -> bool:
+        """Subscribe to a characteristic, logging instead of raising on failure"""
+        try:
+            await client.start_notify(uuid, self.notification_handler)
+        except Exception:
+            self.logger.debug("_get_bar228 start_notify failed on %s", uuid)
+            return False
+        return True
+
     def disconnect_on_missing_services(func: WrapFuncType) -> WrapFuncType:
         """Define a wrapper to disconnect on missing services and characteristics.
 
@@ -123,14 +246,14 @@ class BAR228BluetoothDeviceData:
             try:
                 return await func(self, *args, **kwargs)
             except (BleakServiceMissing, BleakCharacteristicMissing) as ex:
-                logger.warning(
+                self.logger.warning(
                     "%s: Missing service or characteristic, disconnecting to force refetch of GATT services: %s",
-                    self.name,
+                    self._bardevice.name if self._bardevice else "",
                     ex,
                 )
-                if self.client:
-                    await self.client.clear_cache()
-                    await self.client.disconnect()
+                if self._bleclient:
+                    await self._bleclient.clear_cache()
+                    await self._bleclient.disconnect()
                 raise
 
         return cast(WrapFuncType, _async_disconnect_on_missing_services_wrap)
@@ -140,48 +263,21 @@ class BAR228BluetoothDeviceData:
         self, client: BleakClient, device: BAR228Device
     ) -> BAR228Device:
 
-        self._event = asyncio.Event()
+        self._event.clear()
 
-        try:
-            await client.start_notify(
-                BAR228_CHARACTERISTIC_UUID_WRITE1, self.notification_handler
-            )
-        except Exception:
-            self.logger.debug(
-                f"_get_bar228 start_notify failed on {BAR228_CHARACTERISTIC_UUID_WRITE1}"
-            )
-        try:
-            await client.start_notify(
-                BAR228_CHARACTERISTIC_UUID_WRITE2, self.notification_handler
-            )
-        except Exception:
-            self.logger.debug(
-                f"_get_bar228 start_notify failed on {BAR228_CHARACTERISTIC_UUID_WRITE2}"
-            )
-        try:
-            await client.start_notify(
-                BAR228_CHARACTERISTIC_UUID_WRITE3, self.notification_handler
-            )
-        except Exception:
-            self.logger.debug(
-                f"_get_bar228 start_notify failed on {BAR228_CHARACTERISTIC_UUID_WRITE3}"
-            )
-        try:
-            await client.start_notify(
-                BAR228_CHARACTERISTIC_UUID_WRITE4, self.notification_handler
-            )
-        except Exception:
-            self.logger.debug(
-                f"_get_bar228 start_notify failed on {BAR228_CHARACTERISTIC_UUID_WRITE4}"
-            )
-        try:
-            await client.start_notify(
-                BAR228_CHARACTERISTIC_UUID_WRITE5, self.notification_handler
-            )
-        except Exception:
-            self.logger.debug(
-                f"_get_bar228 start_notify failed on {BAR228_CHARACTERISTIC_UUID_WRITE5}"
-            )
+        if self._notify_char_uuid is not None and await self._start_notify(
+            client, self._notify_char_uuid
+        ):
+            self.logger.debug("_get_bar228 completed")
+            return device
+
+        if self._notify_uuids is None:
+            discovered = self._discover_notify_uuids(client)
+            if discovered:
+                self._notify_uuids = discovered
+        uuids = self._notify_uuids or BAR228_NOTIFY_UUIDS
+
+        await asyncio.gather(*(self._start_notify(client, uuid) for uuid in uuids))
 
         self.logger.debug("_get_bar228 completed")
 
@@ -191,16 +287,17 @@ class BAR228BluetoothDeviceData:
         """Connects to the device through BLE and retrieves relevant data"""
         self.logger.debug("update_device - begin")
 
+        client = self._bleclient
+        if client is not None and client.is_connected and self._notify_count > 0:
+            self.logger.debug("update_device - notifications streaming, end")
+            return self._bardevice
+
         if self._bardevice is not None:
             self.logger.debug("update_device - returning existing _bardevice")
         else:
             self._bardevice = BAR228Device()
             self._bardevice.name = ble_device.name
             self._bardevice.address = ble_device.address
-            self._bardevice.sensors["temperature"] = None
-            self._bardevice.sensors["humidity"] = None
-            self._bardevice.sensors["pressure"] = None
-            self._bardevice.sensors["last"] = None
             self._command_data = None
             self.logger.debug("update_device - returning new _bardevice")
 
@@ -208,10 +305,15 @@ class BAR228BluetoothDeviceData:
             self.logger.debug("update_device - existing _bleclient begin")
             if not self._bleclient.is_connected:
                 self.logger.debug("existing _bleclient not connected")
-                await self._bleclient.connect()
+                self._notify_count = 0
+                self._bleclient = await establish_connection(
+                    BleakClient, ble_device, ble_device.address
+                )
                 self._bardevice = await self._get_bar228(
                     self._bleclient, self._bardevice
                 )
+                self._last_seen = time.monotonic()
+                self._schedule_idle_disconnect()
                 self.logger.debug("update_device - existing _bleclient re-connected")
             self.logger.debug("update_device - existing _bleclient end")
         else:
@@ -223,6 +325,8 @@ class BAR228BluetoothDeviceData:
                 self._bardevice = await self._get_bar228(
                     self._bleclient, self._bardevice
                 )
+            self._last_seen = time.monotonic()
+            self._schedule_idle_disconnect()
             self.logger.debug("update_device - new _bleclient end")
 
         self.logger.debug("update_device - end")
@@ -70,19 +70,13 @@ async def async_setup_entry(
 
     coordinator: DataUpdateCoordinator[BAR228Device] = hass.data[DOMAIN][entry.entry_id]
 
-    sensors_mapping = SENSORS_MAPPING_TEMPLATE.copy()
     entities = []
     _LOGGER.debug("got sensors: %s", coordinator.data.sensors)
-    for sensor_type, sensor_value in coordinator.data.sensors.items():
-        if sensor_type not in sensors_mapping:
-            _LOGGER.debug(
-                "Unknown sensor type detected: %s, %s",
-                sensor_type,
-                sensor_value,
-            )
-            continue
+    for sensor_type in ("temperature", "humidity", "pressure", "last"):
         entities.append(
-            BAR228Sensor(coordinator, coordinator.data, sensors_mapping[sensor_type])
+            BAR228Sensor(
+                coordinator, coordinator.data, SENSORS_MAPPING_TEMPLATE[sensor_type]
+            )
         )
 
     async_add_entities(entities)
@@ -128,7 +122,4 @@ class BAR228Sensor(CoordinatorEntity[DataUpdateCoordinator[BAR228Device]], Senso
     @property
     def native_value(self) -> StateType:
         """Return the value reported by the sensor."""
-        try:
-            return self.coordinator.data.sensors[self.entity_description.key]
-        except KeyError:
-            return None
+        return getattr(self.coordinator.data, self.entity_description.key, None)